@@ -16,19 +16,114 @@ Example: To swap a person from photo A into the scene from photo B:
 import os
 import requests
 import json
-import boto3
-from botocore.client import Config
 import time
-import base64
+import random
+import hashlib
+import mimetypes
+import warnings
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 import logging
 
+# SIMD-accelerated base64 when available
+try:
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default number of concurrent jobs for batch processing
+DEFAULT_MAX_WORKERS = 8
+
+# Connection pool size shared by the S3 client and the HTTP session
+MAX_POOL_CONNECTIONS = 32
+
+# S3 multipart upload settings
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+# Base64 decode chunk size (must be a multiple of 4)
+B64_DECODE_CHUNK = 4 * 64 * 1024
+
+# Response header carrying job status on HEAD requests, when the endpoint provides it
+STATUS_HEADER = 'X-Runpod-Status'
+
+# Read size used when hashing input files
+HASH_READ_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=1024)
+def _file_sha256(file_path: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 hex digest of a file, memoized by (path, mtime, size)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_READ_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileResult:
+    """Per-file outcome of a batch edit"""
+    __slots__ = ('filename', 'status', 'output_file', 'error', 'job_id')
+
+    def __init__(
+        self,
+        filename: str,
+        status: str,
+        output_file: Optional[str] = None,
+        error: Optional[str] = None,
+        job_id: Optional[str] = None
+    ):
+        self.filename = filename
+        self.status = status
+        self.output_file = output_file
+        self.error = error
+        self.job_id = job_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a result dictionary, omitting output_file/error when unset"""
+        result = {"filename": self.filename, "status": self.status}
+        if self.output_file is not None:
+            result["output_file"] = self.output_file
+        if self.error is not None:
+            result["error"] = self.error
+        result["job_id"] = self.job_id
+        return result
+
+
 class QwenImageEditS3Client:
+    # API input templates (fixed key order for serialized payloads)
+    _SINGLE_TEMPLATE = {
+        "image_path": None,
+        "prompt": None,
+        "seed": 0,
+        "width": 1024,
+        "height": 1024,
+        "steps": 40,
+        "cfg": 4.0,
+        "negative_prompt": " "
+    }
+    _DUAL_TEMPLATE = {
+        "image_path": None,
+        "image_path_2": None,
+        "prompt": None,
+        "seed": 0,
+        "width": 1024,
+        "height": 1024,
+        "steps": 40,
+        "cfg": 4.0,
+        "negative_prompt": " "
+    }
+
     def __init__(
         self,
         runpod_endpoint_id: str,
@@ -63,14 +158,32 @@ class QwenImageEditS3Client:
         self.s3_bucket_name = s3_bucket_name
         self.s3_region = s3_region
 
-        # Initialize S3 client
+        # Initialize S3 client (boto3 is imported lazily to keep module import cheap)
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.client import Config
+
         self.s3_client = boto3.client(
             's3',
             endpoint_url=s3_endpoint_url,
             aws_access_key_id=s3_access_key_id,
             aws_secret_access_key=s3_secret_access_key,
             region_name=s3_region,
-            config=Config(signature_version='s3v4')
+            config=Config(
+                signature_version='s3v4',
+                max_pool_connections=MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True,
+                retries={'max_attempts': 5, 'mode': 'adaptive'}
+            )
+        )
+
+        # Large files are uploaded as concurrent multipart chunks; small files
+        # bypass the transfer manager and use a single put_object call
+        self._transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNKSIZE,
+            max_concurrency=8,
+            use_threads=True
         )
 
         # Initialize HTTP session
@@ -79,16 +192,75 @@ class QwenImageEditS3Client:
             'Authorization': f'Bearer {runpod_api_key}',
             'Content-Type': 'application/json'
         })
+        # Size the connection pool for concurrent batch jobs and retry transient errors
+        adapter = HTTPAdapter(
+            pool_connections=MAX_POOL_CONNECTIONS,
+            pool_maxsize=MAX_POOL_CONNECTIONS,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+
+        # Output directories already created by save_image_result
+        self._dirs_created = set()
+
+        # Whether the status endpoint answers HEAD with a status header (None = not probed yet)
+        self._head_status_supported: Optional[bool] = None
 
         logger.info(f"QwenImageEditS3Client initialized - Endpoint: {runpod_endpoint_id}")
 
-    def upload_to_s3(self, file_path: str, s3_key: str) -> Optional[str]:
+    @staticmethod
+    def _content_key(file_path: str) -> str:
+        """
+        Build a content-addressed S3 key for a file
+
+        Args:
+            file_path: Local path of file
+
+        Returns:
+            S3 key derived from the file's SHA-256 hash
+        """
+        stat = os.stat(file_path)
+        hexdigest = _file_sha256(file_path, stat.st_mtime_ns, stat.st_size)
+        ext = os.path.splitext(file_path)[1].lower()
+        return f"input/qwen/{hexdigest[:2]}/{hexdigest}{ext}"
+
+    @staticmethod
+    def _has_extension(filename: str, extensions: frozenset) -> bool:
+        """
+        Check a filename's extension against a set of lowercase extensions
+
+        Args:
+            filename: File name to check
+            extensions: Lowercase extensions without the leading dot
+
+        Returns:
+            Whether the file has one of the given extensions
+        """
+        _, dot, ext = filename.rpartition('.')
+        return bool(dot) and ext.lower() in extensions
+
+    @staticmethod
+    def _resolve_steps(steps: int, use_lightning: bool) -> int:
+        """
+        Resolve inference steps, overriding to 4 in Lightning mode
+
+        Args:
+            steps: Requested number of inference steps
+            use_lightning: Whether Lightning mode is enabled
+
+        Returns:
+            Number of inference steps to use
+        """
+        return 4 if use_lightning else steps
+
+    def upload_to_s3(self, file_path: str, s3_key: str, skip_if_exists: bool = False) -> Optional[str]:
         """
         Upload file to S3
 
         Args:
             file_path: Local path of file to upload
             s3_key: Key (path) to store in S3
+            skip_if_exists: Skip the upload if the key already exists (only safe for content-addressed keys)
 
         Returns:
             S3 path or None (on failure)
@@ -98,11 +270,40 @@ class QwenImageEditS3Client:
                 logger.error(f"File does not exist: {file_path}")
                 return None
 
+            s3_path = f"/runpod-volume/{s3_key}"
+
+            # Skip the upload if identical content is already stored
+            if skip_if_exists:
+                from botocore.exceptions import ClientError
+
+                try:
+                    self.s3_client.head_object(Bucket=self.s3_bucket_name, Key=s3_key)
+                    logger.info(f"⏭️ S3 object already exists, skipping upload: {s3_path}")
+                    return s3_path
+                except ClientError:
+                    # Missing object or no HeadObject permission: upload as usual
+                    pass
+
             logger.info(f"S3 upload started: {file_path} -> s3://{self.s3_bucket_name}/{s3_key}")
 
-            self.s3_client.upload_file(file_path, self.s3_bucket_name, s3_key)
+            content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            if os.path.getsize(file_path) < MULTIPART_THRESHOLD:
+                with open(file_path, 'rb') as f:
+                    self.s3_client.put_object(
+                        Bucket=self.s3_bucket_name,
+                        Key=s3_key,
+                        Body=f,
+                        ContentType=content_type
+                    )
+            else:
+                self.s3_client.upload_file(
+                    file_path,
+                    self.s3_bucket_name,
+                    s3_key,
+                    ExtraArgs={'ContentType': content_type},
+                    Config=self._transfer_config
+                )
 
-            s3_path = f"/runpod-volume/{s3_key}"
             logger.info(f"✅ S3 upload successful: {s3_path}")
             return s3_path
 
@@ -110,6 +311,24 @@ class QwenImageEditS3Client:
             logger.error(f"❌ S3 upload failed: {e}")
             return None
 
+    def _upload_content_addressed(self, file_path: str) -> Optional[str]:
+        """
+        Upload file to S3 under its content hash, skipping existing objects
+
+        Args:
+            file_path: Local path of file to upload
+
+        Returns:
+            S3 path or None (on failure)
+        """
+        try:
+            s3_key = self._content_key(file_path)
+        except OSError as e:
+            logger.error(f"❌ S3 upload failed: {e}")
+            return None
+
+        return self.upload_to_s3(file_path, s3_key, skip_if_exists=True)
+
     def submit_job(self, input_data: Dict[str, Any]) -> Optional[str]:
         """
         Submit job to RunPod
@@ -124,7 +343,8 @@ class QwenImageEditS3Client:
 
         try:
             logger.info(f"Submitting job to RunPod: {self.runpod_api_endpoint}")
-            logger.info(f"Input data: {json.dumps(input_data, indent=2, ensure_ascii=False)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Input data: %s", json.dumps(input_data, ensure_ascii=False))
 
             response = self.session.post(self.runpod_api_endpoint, json=payload, timeout=30)
             response.raise_for_status()
@@ -143,29 +363,117 @@ class QwenImageEditS3Client:
             logger.error(f"❌ Job submission failed: {e}")
             return None
 
-    def wait_for_completion(self, job_id: str, check_interval: int = 10, max_wait_time: int = 1800) -> Dict[str, Any]:
+    def _read_status(self, response: requests.Response) -> Dict[str, Any]:
+        """
+        Parse a streamed status response, reading the body only once
+
+        Parse and transport errors are raised as requests exceptions so
+        status polling retries them.
+
+        Args:
+            response: Status response opened with stream=True
+
+        Returns:
+            Status dictionary
+        """
+        response.raw.decode_content = True
+        try:
+            return json.load(response.raw)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(e, response=response) from e
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, response=response) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e, response=response) from e
+
+    def _probe_status(self, job_id: str) -> Optional[str]:
+        """
+        Probe job status with a lightweight HEAD request
+
+        HEAD probing is disabled for this client after a successful response
+        without a status header (or a 405/501), so unsupported endpoints cost
+        one request. Other failures fall back to a GET for this poll only.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job status from the response header or None (if unavailable)
+        """
+        if self._head_status_supported is False:
+            return None
+
+        try:
+            response = self.session.head(f"{self.status_url}/{job_id}", timeout=10)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"HEAD status probe failed, falling back to GET: {e}")
+            return None
+
+        if response.status_code in (405, 501):
+            self._head_status_supported = False
+            return None
+        if not response.ok:
+            # Transient errors (429, 5xx) do not say anything about header support
+            return None
+
+        status = response.headers.get(STATUS_HEADER)
+        self._head_status_supported = status is not None
+        return status
+
+    def wait_for_completion(
+        self,
+        job_id: str,
+        check_interval: Optional[float] = None,
+        max_wait_time: int = 1800,
+        initial_interval: float = 1.0,
+        max_interval: float = 15.0
+    ) -> Dict[str, Any]:
         """
         Wait for job completion
 
+        Status is polled with exponential backoff plus jitter: fast Lightning
+        jobs are detected quickly while long jobs are polled less often.
+
         Args:
             job_id: Job ID
-            check_interval: Status check interval (seconds)
+            check_interval: Deprecated, use max_interval (seconds)
             max_wait_time: Maximum wait time (seconds)
+            initial_interval: First status check interval (seconds)
+            max_interval: Maximum status check interval (seconds)
 
         Returns:
             Job result dictionary
         """
+        if check_interval is not None:
+            warnings.warn(
+                "check_interval is deprecated, use max_interval instead",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            max_interval = check_interval
+
         start_time = time.time()
+        attempt = 0
+        previous_status = None
+
+        def _backoff_sleep() -> None:
+            interval = min(max_interval, initial_interval * (1.5 ** attempt)) + random.uniform(0, 1)
+            time.sleep(interval)
 
         while time.time() - start_time < max_wait_time:
             try:
                 logger.info(f"⏱️ Checking job status... (Job ID: {job_id})")
 
-                response = self.session.get(f"{self.status_url}/{job_id}", timeout=30)
-                response.raise_for_status()
+                # Only fetch the full status body once the job may have finished
+                status = self._probe_status(job_id)
+                if status in ('IN_QUEUE', 'IN_PROGRESS'):
+                    status_data = {'status': status}
+                else:
+                    with self.session.get(f"{self.status_url}/{job_id}", stream=True, timeout=30) as response:
+                        response.raise_for_status()
+                        status_data = self._read_status(response)
 
-                status_data = response.json()
-                status = status_data.get('status')
+                    status = status_data.get('status')
 
                 if status == 'COMPLETED':
                     logger.info("✅ Job completed!")
@@ -183,7 +491,12 @@ class QwenImageEditS3Client:
                     }
                 elif status in ['IN_QUEUE', 'IN_PROGRESS']:
                     logger.info(f"🏃 Job in progress... (status: {status})")
-                    time.sleep(check_interval)
+                    # Poll more aggressively once the job leaves the queue
+                    if status == 'IN_PROGRESS' and previous_status == 'IN_QUEUE':
+                        attempt = 0
+                    previous_status = status
+                    _backoff_sleep()
+                    attempt += 1
                 else:
                     logger.warning(f"❓ Unknown status: {status}")
                     return {
@@ -194,7 +507,8 @@ class QwenImageEditS3Client:
 
             except requests.exceptions.RequestException as e:
                 logger.error(f"❌ Error checking status: {e}")
-                time.sleep(check_interval)
+                _backoff_sleep()
+                attempt += 1
 
         logger.error(f"❌ Job wait timeout ({max_wait_time} seconds)")
         return {
@@ -225,20 +539,35 @@ class QwenImageEditS3Client:
                 logger.error("No image data available")
                 return False
 
-            # Create directory
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            # Create directory (once per client)
+            output_dir = os.path.normpath(os.path.dirname(output_path) or '.')
+            if output_dir not in self._dirs_created:
+                os.makedirs(output_dir, exist_ok=True)
+                self._dirs_created.add(output_dir)
 
-            # Remove data URI prefix if present
-            if ',' in image_b64:
-                image_b64 = image_b64.split(',', 1)[1]
+            # Skip data URI prefix if present
+            start = image_b64.find(',') + 1
 
-            # Decode and save image
-            decoded_image = base64.b64decode(image_b64)
+            # Chunked decoding needs unbroken base64; strip line wrapping if present
+            if any(ws in image_b64 for ws in ('\n', '\r', ' ', '\t')):
+                image_b64 = ''.join(image_b64[start:].split())
+                start = 0
 
-            with open(output_path, 'wb') as f:
-                f.write(decoded_image)
+            # Decode and save image in chunks to bound peak memory
+            file_size = 0
+            try:
+                f = open(output_path, 'wb')
+            except FileNotFoundError:
+                # Directory was removed after it was cached; recreate it once
+                self._dirs_created.discard(output_dir)
+                os.makedirs(output_dir, exist_ok=True)
+                self._dirs_created.add(output_dir)
+                f = open(output_path, 'wb')
+
+            with f:
+                for i in range(start, len(image_b64), B64_DECODE_CHUNK):
+                    file_size += f.write(_b64.b64decode(image_b64[i:i + B64_DECODE_CHUNK], validate=False))
 
-            file_size = os.path.getsize(output_path)
             logger.info(f"✅ Image saved successfully: {output_path} ({file_size / 1024:.1f}KB)")
             return True
 
@@ -280,29 +609,28 @@ class QwenImageEditS3Client:
             return {"error": f"Image file does not exist: {image_path}"}
 
         # Upload image to S3
-        timestamp = int(time.time())
-        image_s3_key = f"input/qwen/{timestamp}_{os.path.basename(image_path)}"
-        image_s3_path = self.upload_to_s3(image_path, image_s3_key)
+        image_s3_path = self._upload_content_addressed(image_path)
 
         if not image_s3_path:
             return {"error": "Image S3 upload failed"}
 
         # Override steps if Lightning mode enabled
         if use_lightning:
-            steps = 4
             logger.info("⚡ Lightning mode enabled: using 4 steps for faster generation")
+        steps = self._resolve_steps(steps, use_lightning)
 
         # Configure API input data
-        input_data = {
-            "image_path": image_s3_path,
-            "prompt": prompt,
-            "seed": seed,
-            "width": width,
-            "height": height,
-            "steps": steps,
-            "cfg": cfg,
-            "negative_prompt": negative_prompt
-        }
+        input_data = self._SINGLE_TEMPLATE.copy()
+        input_data.update(
+            image_path=image_s3_path,
+            prompt=prompt,
+            seed=seed,
+            width=width,
+            height=height,
+            steps=steps,
+            cfg=cfg,
+            negative_prompt=negative_prompt
+        )
 
         # Submit job and wait
         job_id = self.submit_job(input_data)
@@ -359,40 +687,37 @@ class QwenImageEditS3Client:
         if not os.path.exists(image_path_2):
             return {"error": f"Second image file does not exist: {image_path_2}"}
 
-        # Upload images to S3
-        timestamp = int(time.time())
-
-        # Upload first image (donor)
-        image_s3_key = f"input/qwen/{timestamp}_donor_{os.path.basename(image_path)}"
-        image_s3_path = self.upload_to_s3(image_path, image_s3_key)
+        # Upload first image (donor) and second image (canvas) concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            donor_future = executor.submit(self._upload_content_addressed, image_path)
+            canvas_future = executor.submit(self._upload_content_addressed, image_path_2)
+            image_s3_path = donor_future.result()
+            image_s3_path_2 = canvas_future.result()
 
         if not image_s3_path:
             return {"error": "First image S3 upload failed"}
 
-        # Upload second image (canvas)
-        image_s3_key_2 = f"input/qwen/{timestamp}_canvas_{os.path.basename(image_path_2)}"
-        image_s3_path_2 = self.upload_to_s3(image_path_2, image_s3_key_2)
-
         if not image_s3_path_2:
             return {"error": "Second image S3 upload failed"}
 
         # Override steps if Lightning mode enabled
         if use_lightning:
-            steps = 4
             logger.info("⚡ Lightning mode enabled: using 4 steps for faster generation")
+        steps = self._resolve_steps(steps, use_lightning)
 
         # Configure API input data
-        input_data = {
-            "image_path": image_s3_path,
-            "image_path_2": image_s3_path_2,
-            "prompt": prompt,
-            "seed": seed,
-            "width": width,
-            "height": height,
-            "steps": steps,
-            "cfg": cfg,
-            "negative_prompt": negative_prompt
-        }
+        input_data = self._DUAL_TEMPLATE.copy()
+        input_data.update(
+            image_path=image_s3_path,
+            image_path_2=image_s3_path_2,
+            prompt=prompt,
+            seed=seed,
+            width=width,
+            height=height,
+            steps=steps,
+            cfg=cfg,
+            negative_prompt=negative_prompt
+        )
 
         # Submit job and wait
         job_id = self.submit_job(input_data)
@@ -414,11 +739,15 @@ class QwenImageEditS3Client:
         steps: int = 40,
         cfg: float = 4.0,
         negative_prompt: str = " ",
-        use_lightning: bool = False
+        use_lightning: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS
     ) -> Dict[str, Any]:
         """
         Batch process image edits from folder
 
+        Images are uploaded and submitted concurrently; RunPod executes the
+        jobs server-side in parallel while this client waits on them.
+
         Args:
             image_folder_path: Folder path containing image files
             output_folder_path: Folder path to save results
@@ -431,6 +760,7 @@ class QwenImageEditS3Client:
             cfg: CFG scale / true_cfg_scale
             negative_prompt: Negative prompt
             use_lightning: Use Lightning mode for faster generation
+            max_workers: Maximum number of images processed concurrently
 
         Returns:
             Batch processing result dictionary
@@ -441,78 +771,99 @@ class QwenImageEditS3Client:
 
         # Create output folder
         os.makedirs(output_folder_path, exist_ok=True)
+        self._dirs_created.add(os.path.normpath(output_folder_path))
 
         # Get image file list
-        image_files = [
-            f for f in os.listdir(image_folder_path)
-            if f.lower().endswith(valid_image_extensions)
-        ]
+        image_extensions = frozenset(ext.lower().lstrip('.') for ext in valid_image_extensions)
+        with os.scandir(image_folder_path) as it:
+            image_files = [
+                entry for entry in it
+                if self._has_extension(entry.name, image_extensions) and entry.is_file()
+            ]
 
         if not image_files:
             return {"error": f"No image files to process: {image_folder_path}"}
 
-        logger.info(f"Batch processing started: {len(image_files)} images")
+        logger.info(f"Batch processing started: {len(image_files)} images ({max_workers} workers)")
+        if use_lightning:
+            logger.info("⚡ Lightning mode enabled: using 4 steps for faster generation")
 
-        results = {
-            "total_files": len(image_files),
-            "successful": 0,
-            "failed": 0,
-            "results": []
-        }
+        # Resolve Lightning steps once so per-image edits do not log the override again
+        steps = self._resolve_steps(steps, use_lightning)
+
+        # Output names must be unique: a.jpg and a.png would otherwise both be
+        # saved to edited_a.png by concurrent workers
+        stem_counts = Counter(Path(entry.name).stem for entry in image_files)
+        output_filenames = []
+        used_names = set()
+        for i, entry in enumerate(image_files):
+            source = Path(entry.name)
+            if stem_counts[source.stem] > 1:
+                name = f"edited_{source.stem}_{source.suffix.lstrip('.')}.png"
+            else:
+                name = f"edited_{source.stem}.png"
+            if name in used_names:
+                name = f"edited_{source.stem}_{i}.png"
+            used_names.add(name)
+            output_filenames.append(os.path.join(output_folder_path, name))
 
-        # Process each image file
-        for i, image_filename in enumerate(image_files):
-            logger.info(f"\n==================== Processing started: {image_filename} ====================")
+        results_list: List[Optional[FileResult]] = [None] * len(image_files)
 
-            image_path = os.path.join(image_folder_path, image_filename)
+        def _process_one(i: int, entry: os.DirEntry) -> FileResult:
+            image_filename = entry.name
+            logger.info("\n==================== Processing started: %s ====================", image_filename)
 
             # Edit image
             result = self.edit_single_image(
-                image_path=image_path,
+                image_path=entry.path,
                 prompt=prompt,
                 seed=seed + i,  # Different seed for each file
                 width=width,
                 height=height,
                 steps=steps,
                 cfg=cfg,
-                negative_prompt=negative_prompt,
-                use_lightning=use_lightning
+                negative_prompt=negative_prompt
             )
 
             if result.get('status') == 'COMPLETED':
                 # Save result file
-                base_filename = Path(image_filename).stem
-                output_filename = os.path.join(output_folder_path, f"edited_{base_filename}.png")
+                output_filename = output_filenames[i]
 
                 if self.save_image_result(result, output_filename):
                     logger.info(f"✅ [{image_filename}] Processing completed")
-                    results["successful"] += 1
-                    results["results"].append({
-                        "filename": image_filename,
-                        "status": "success",
-                        "output_file": output_filename,
-                        "job_id": result.get('job_id')
-                    })
+                    file_result = FileResult(image_filename, "success", output_file=output_filename, job_id=result.get('job_id'))
                 else:
                     logger.error(f"[{image_filename}] Result save failed")
-                    results["failed"] += 1
-                    results["results"].append({
-                        "filename": image_filename,
-                        "status": "failed",
-                        "error": "Result save failed",
-                        "job_id": result.get('job_id')
-                    })
+                    file_result = FileResult(image_filename, "failed", error="Result save failed", job_id=result.get('job_id'))
             else:
                 logger.error(f"[{image_filename}] Job failed: {result.get('error', 'Unknown error')}")
-                results["failed"] += 1
-                results["results"].append({
-                    "filename": image_filename,
-                    "status": "failed",
-                    "error": result.get('error', 'Unknown error'),
-                    "job_id": result.get('job_id')
-                })
-
-            logger.info(f"==================== Processing completed: {image_filename} ====================")
+                file_result = FileResult(image_filename, "failed", error=result.get('error', 'Unknown error'), job_id=result.get('job_id'))
+
+            logger.info("==================== Processing completed: %s ====================", image_filename)
+            return file_result
+
+        # Process image files concurrently; each worker owns one slot of results_list
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_process_one, i, entry): i
+                for i, entry in enumerate(image_files)
+            }
+
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results_list[i] = future.result()
+                except Exception as e:
+                    logger.error(f"[{image_files[i].name}] Unexpected error: {e}")
+                    results_list[i] = FileResult(image_files[i].name, "failed", error=str(e))
+
+        successful = sum(1 for r in results_list if r.status == "success")
+        results = {
+            "total_files": len(image_files),
+            "successful": successful,
+            "failed": len(image_files) - successful,
+            "results": [r.to_dict() for r in results_list]
+        }
 
         logger.info(f"\n🎉 Batch processing completed: {results['successful']}/{results['total_files']} successful")
         return results
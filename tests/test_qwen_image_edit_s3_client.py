@@ -0,0 +1,294 @@
+import base64
+import hashlib
+import io
+import os
+from unittest import mock
+
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("boto3")
+urllib3 = pytest.importorskip("urllib3")
+
+from qwen_image_edit_s3_client import QwenImageEditS3Client
+
+
+class TruncatedRaw:
+    """Raw response body that is cut off mid-stream"""
+
+    decode_content = False
+
+    def read(self, size=-1):
+        raise urllib3.exceptions.ProtocolError("Connection broken: IncompleteRead")
+
+
+@pytest.fixture
+def client():
+    return QwenImageEditS3Client(
+        runpod_endpoint_id="endpoint",
+        runpod_api_key="key",
+        s3_endpoint_url="https://s3.example.com",
+        s3_access_key_id="access",
+        s3_secret_access_key="secret",
+        s3_bucket_name="bucket",
+    )
+
+
+def make_response(raw):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = raw
+    return response
+
+
+def test_read_status_parses_body(client):
+    body = b'{"id": "job", "status": "COMPLETED", "output": {"image": "aGk="}}'
+    status_data = client._read_status(make_response(io.BytesIO(body)))
+    assert status_data["status"] == "COMPLETED"
+    assert status_data["output"]["image"] == "aGk="
+
+
+def test_read_status_non_json_body_raises_request_exception(client):
+    response = make_response(io.BytesIO(b"<html>Bad Gateway</html>"))
+    with pytest.raises(requests.exceptions.RequestException):
+        client._read_status(response)
+
+
+def test_read_status_truncated_body_raises_request_exception(client):
+    with pytest.raises(requests.exceptions.RequestException):
+        client._read_status(make_response(TruncatedRaw()))
+
+
+def test_edit_single_image_unreadable_path_returns_error(client, tmp_path):
+    result = client.edit_single_image(image_path=str(tmp_path), prompt="edit")
+    assert result == {"error": "Image S3 upload failed"}
+
+
+def test_edit_dual_image_unreadable_path_returns_error(client, tmp_path):
+    canvas = tmp_path / "canvas.png"
+    canvas.write_bytes(b"png")
+    client.s3_client = mock.MagicMock()
+    result = client.edit_dual_image(image_path=str(tmp_path), image_path_2=str(canvas), prompt="edit")
+    assert result == {"error": "First image S3 upload failed"}
+
+
+def test_wait_for_completion_accepts_deprecated_check_interval(client):
+    client._probe_status = mock.MagicMock(return_value=None)
+    client._read_status = mock.MagicMock(return_value={"status": "COMPLETED", "output": {}})
+    client.session = mock.MagicMock()
+    with pytest.warns(DeprecationWarning):
+        result = client.wait_for_completion("job", check_interval=10)
+    assert result["status"] == "COMPLETED"
+
+
+def test_batch_results_omit_unset_fields(client, tmp_path):
+    (tmp_path / "ok.png").write_bytes(b"png")
+    (tmp_path / "bad.png").write_bytes(b"png")
+
+    def fake_edit(image_path, **kwargs):
+        if image_path.endswith("ok.png"):
+            return {"status": "COMPLETED", "output": {"image": "aGk="}, "job_id": "job-ok"}
+        return {"status": "FAILED", "error": "boom", "job_id": "job-bad"}
+
+    client.edit_single_image = fake_edit
+    results = client.batch_edit_images(str(tmp_path), output_folder_path=str(tmp_path / "out"))
+
+    by_name = {r["filename"]: r for r in results["results"]}
+    assert "error" not in by_name["ok.png"]
+    assert by_name["ok.png"]["job_id"] == "job-ok"
+    assert "output_file" not in by_name["bad.png"]
+    assert by_name["bad.png"]["error"] == "boom"
+    assert results["successful"] == 1
+    assert results["failed"] == 1
+
+
+@pytest.mark.parametrize("prefix", ["", "data:image/png;base64,"])
+def test_save_image_result_decodes_line_wrapped_base64(client, tmp_path, prefix):
+    data = bytes(range(256)) * 4096
+    image_b64 = prefix + base64.encodebytes(data).decode("ascii")
+    output_path = tmp_path / "out.png"
+
+    assert client.save_image_result({"status": "COMPLETED", "output": {"image": image_b64}}, str(output_path))
+    assert output_path.read_bytes() == data
+
+
+@pytest.mark.parametrize("size", [16, 9 * 1024 * 1024])
+def test_upload_to_s3_sets_content_type(client, tmp_path, size):
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"\0" * size)
+    client.s3_client = mock.MagicMock()
+
+    assert client.upload_to_s3(str(image_path), "input/qwen/image.png") == "/runpod-volume/input/qwen/image.png"
+
+    if client.s3_client.put_object.called:
+        assert client.s3_client.put_object.call_args.kwargs["ContentType"] == "image/png"
+    else:
+        extra_args = client.s3_client.upload_file.call_args.kwargs["ExtraArgs"]
+        assert extra_args == {"ContentType": "image/png"}
+
+
+def test_save_image_result_recreates_removed_output_dir(client, tmp_path):
+    result = {"status": "COMPLETED", "output": {"image": "aGk="}}
+    output_dir = tmp_path / "out"
+    output_path = output_dir / "x.png"
+
+    assert client.save_image_result(result, str(output_path))
+    output_path.unlink()
+    output_dir.rmdir()
+
+    assert client.save_image_result(result, str(output_path))
+    assert output_path.read_bytes() == b"hi"
+
+
+def test_batch_output_folder_with_trailing_slash_is_created_once(client, tmp_path):
+    (tmp_path / "a.png").write_bytes(b"png")
+    client.edit_single_image = lambda image_path, **kwargs: {
+        "status": "COMPLETED", "output": {"image": "aGk="}, "job_id": "job"
+    }
+
+    with mock.patch("os.makedirs", wraps=os.makedirs) as makedirs:
+        results = client.batch_edit_images(str(tmp_path), output_folder_path=str(tmp_path / "out") + "/")
+
+    assert results["successful"] == 1
+    assert makedirs.call_count == 1
+
+
+def make_head_response(status_code, status=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if status is not None:
+        response.headers["X-Runpod-Status"] = status
+    return response
+
+
+def test_probe_status_transient_error_keeps_head_enabled(client):
+    client.session = mock.MagicMock()
+    client.session.head.side_effect = [make_head_response(200, "IN_QUEUE"), make_head_response(503)]
+
+    assert client._probe_status("job") == "IN_QUEUE"
+    assert client._probe_status("job") is None
+    assert client._head_status_supported is True
+
+
+@pytest.mark.parametrize("status_code", [200, 405, 501])
+def test_probe_status_unsupported_disables_head(client, status_code):
+    client.session = mock.MagicMock()
+    client.session.head.return_value = make_head_response(status_code)
+
+    assert client._probe_status("job") is None
+    assert client._head_status_supported is False
+
+    assert client._probe_status("job") is None
+    assert client.session.head.call_count == 1
+
+
+def test_wait_for_completion_falls_back_to_get_when_head_raises(client):
+    client.session = mock.MagicMock()
+    client.session.head.side_effect = requests.exceptions.ConnectionError("reset")
+    client._read_status = mock.MagicMock(return_value={"status": "COMPLETED", "output": {}})
+
+    result = client.wait_for_completion("job")
+
+    assert result["status"] == "COMPLETED"
+    client.session.get.assert_called_once()
+
+
+def test_wait_for_completion_skips_get_while_head_reports_in_progress(client):
+    client.session = mock.MagicMock()
+    client.session.head.side_effect = [
+        make_head_response(200, "IN_QUEUE"),
+        make_head_response(200, "IN_PROGRESS"),
+        make_head_response(200, "COMPLETED"),
+    ]
+    client._read_status = mock.MagicMock(return_value={"status": "COMPLETED", "output": {}})
+
+    with mock.patch("time.sleep"):
+        result = client.wait_for_completion("job")
+
+    assert result["status"] == "COMPLETED"
+    assert client.session.head.call_count == 3
+    client.session.get.assert_called_once()
+
+
+def test_batch_resolves_lightning_steps_once(client, tmp_path):
+    (tmp_path / "a.png").write_bytes(b"png")
+    client.edit_single_image = mock.MagicMock(return_value={"status": "FAILED", "error": "boom"})
+
+    client.batch_edit_images(str(tmp_path), output_folder_path=str(tmp_path / "out"), use_lightning=True)
+
+    kwargs = client.edit_single_image.call_args.kwargs
+    assert kwargs["steps"] == 4
+    assert "use_lightning" not in kwargs
+
+
+def test_batch_output_names_are_unique_for_shared_stems(client, tmp_path):
+    for name in ("a.jpg", "a.png", "b.png"):
+        (tmp_path / name).write_bytes(b"png")
+    client.edit_single_image = lambda image_path, **kwargs: {
+        "status": "COMPLETED", "output": {"image": "aGk="}, "job_id": "job"
+    }
+
+    results = client.batch_edit_images(str(tmp_path), output_folder_path=str(tmp_path / "out"))
+
+    output_files = {os.path.basename(r["output_file"]) for r in results["results"]}
+    assert output_files == {"edited_a_jpg.png", "edited_a_png.png", "edited_b.png"}
+
+
+def test_upload_to_s3_skips_existing_object(client, tmp_path):
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png")
+    client.s3_client = mock.MagicMock()
+
+    s3_path = client.upload_to_s3(str(image_path), "input/qwen/ab/abc.png", skip_if_exists=True)
+
+    assert s3_path == "/runpod-volume/input/qwen/ab/abc.png"
+    client.s3_client.head_object.assert_called_once_with(Bucket="bucket", Key="input/qwen/ab/abc.png")
+    client.s3_client.put_object.assert_not_called()
+
+
+@pytest.mark.parametrize("code", ["404", "403"])
+def test_upload_to_s3_uploads_when_head_object_fails(client, tmp_path, code):
+    from botocore.exceptions import ClientError
+
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png")
+    client.s3_client = mock.MagicMock()
+    client.s3_client.head_object.side_effect = ClientError({"Error": {"Code": code}}, "HeadObject")
+
+    assert client.upload_to_s3(str(image_path), "input/qwen/ab/abc.png", skip_if_exists=True)
+    client.s3_client.put_object.assert_called_once()
+
+
+def test_upload_to_s3_without_skip_never_probes(client, tmp_path):
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"png")
+    client.s3_client = mock.MagicMock()
+
+    assert client.upload_to_s3(str(image_path), "input/qwen/custom.png")
+    client.s3_client.head_object.assert_not_called()
+    client.s3_client.put_object.assert_called_once()
+
+
+def test_content_key_format(tmp_path):
+    image_path = tmp_path / "Photo.JPG"
+    image_path.write_bytes(b"png")
+    digest = hashlib.sha256(b"png").hexdigest()
+
+    key = QwenImageEditS3Client._content_key(str(image_path))
+
+    assert key == f"input/qwen/{digest[:2]}/{digest}.jpg"
+
+
+def test_content_key_rehashes_after_file_changes(tmp_path):
+    image_path = tmp_path / "image.png"
+    image_path.write_bytes(b"first")
+    first_key = QwenImageEditS3Client._content_key(str(image_path))
+
+    image_path.write_bytes(b"second!")
+    stat = image_path.stat()
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second_key = QwenImageEditS3Client._content_key(str(image_path))
+
+    assert second_key != first_key
+    assert hashlib.sha256(b"second!").hexdigest() in second_key